@@ -1,12 +1,21 @@
 """LangGraph AI agent for analyzing business data and generating recommendations.
 
-This module defines a graph with input, processing, and recommendation nodes to
-analyze daily sales, costs, and customer data, producing a summary report with
-actionable advice.
+This module defines a graph that validates daily sales, costs, and customer
+data, calculates key metrics, and produces a summary report with actionable
+advice. The compiled graph runs these steps in a single fused node (or, in
+metrics mode, a single metrics node); the individual input, processing, and
+recommendation nodes remain available for composing the steps separately.
 """
 
-from typing import TypedDict, Optional
-from langgraph.graph import StateGraph, END
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Literal, NamedTuple, Optional, TypedDict, Union, cast
+
+from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
+
 
 # Define state structures
 class BusinessData(TypedDict):
@@ -29,6 +38,15 @@ class Metrics(TypedDict):
     sales_change: float
     cost_change: float
 
+class MetricValues(NamedTuple):
+    """Fixed-layout record of calculated metrics, used inside the nodes."""
+    profit_today: float
+    profit_yesterday: float
+    cac_today: float
+    cac_yesterday: float
+    sales_change: float
+    cost_change: float
+
 class Recommendations(TypedDict):
     """Typed dictionary for recommendations and alerts."""
     profit_status: str
@@ -41,9 +59,90 @@ class State(TypedDict):
     metrics: Optional[Metrics]
     recommendations: Optional[Recommendations]
 
+# What the agent produces: recommendations and alerts, or the metrics only.
+Mode = Literal["full", "metrics"]
+
+# C-level getters for the fixed input schema, one call per group of fields.
+_DAYS = itemgetter("today", "yesterday")
+_FIELDS = itemgetter("sales", "costs", "customers")
+
+# Fixed recommendations, shared by the node and batch paths.
+_REC_REDUCE_COSTS = "Reduce costs to improve profitability"
+_REC_REVIEW_MARKETING = "Review marketing campaigns for efficiency"
+
+# Output message templates, keyed by the kind passed to `_fmt`.
+_TEMPLATES = {
+    "profit": "Profit: ${:.2f}",
+    "loss": "Loss: ${:.2f}",
+    "cac_alert": "CAC increased by {:.2f}%, which is significant.",
+    "sales_rec": "Consider increasing advertising budget due to {:.2f}% sales growth",
+}
+
+@lru_cache(maxsize=4096)
+def _fmt_rounded(kind: str, value: float) -> str:
+    """Format an already rounded value, caching the resulting string."""
+    return _TEMPLATES[kind].format(value)
+
+def _fmt(kind: str, value: float) -> str:
+    """Format a value with a message template.
+
+    Values are rounded to the two displayed decimals first, so recurring
+    outputs such as repeated snapshots reuse the cached string.
+
+    Args:
+        kind: The key of the template in `_TEMPLATES`.
+        value: The value to format.
+
+    Returns:
+        The formatted message.
+    """
+    return _fmt_rounded(kind, round(value, 2))
+
+_INVALID_INPUT = "Invalid input data: 'data' with 'today' and 'yesterday' required"
+
+def _validate(data: Any) -> None:
+    """Check that the input data has both days present.
+
+    Args:
+        data: The input data for today and yesterday.
+
+    Raises:
+        ValueError: If required data fields are missing.
+    """
+    # Subscripting keeps the common, valid case to two lookups; missing keys and
+    # non-dict data fall through to the error.
+    try:
+        if data["today"] and data["yesterday"]:
+            return
+    except (KeyError, TypeError):
+        pass
+    raise ValueError(_INVALID_INPUT)
+
+def _validate_state(state: State) -> DailyData:
+    """Check that the state holds input data with both days present.
+
+    Args:
+        state: The current state containing input data.
+
+    Returns:
+        The validated input data.
+
+    Raises:
+        ValueError: If required data fields are missing.
+    """
+    try:
+        data = state["data"]
+    except (KeyError, TypeError):
+        raise ValueError(_INVALID_INPUT) from None
+    _validate(data)
+    return data
+
 def input_node(state: State) -> State:
     """Validate the input data for required fields.
 
+    Deprecated as a graph node: the graphs run `fused_node` or
+    `metrics_node` instead.
+
     Args:
         state: The current state containing input data.
 
@@ -53,34 +152,53 @@ def input_node(state: State) -> State:
     Raises:
         ValueError: If required data fields are missing.
     """
-    if not state.get("data") or not state["data"].get("today") or not state["data"].get("yesterday"):
-        raise ValueError("Invalid input data: 'data' with 'today' and 'yesterday' required")
+    _validate_state(state)
     return state
 
+def _compute_metrics(ts: float, tc: float, tcu: int, ys: float, yc: float, ycu: int) -> MetricValues:
+    """Calculate the business metrics from the raw input fields.
+
+    Args:
+        ts: Today's sales.
+        tc: Today's costs.
+        tcu: Today's customers.
+        ys: Yesterday's sales.
+        yc: Yesterday's costs.
+        ycu: Yesterday's customers.
+
+    Returns:
+        The calculated metrics.
+    """
+    # Calculate profits
+    profit_today = ts - tc
+    profit_yesterday = ys - yc
+
+    # Calculate Customer Acquisition Cost (CAC)
+    cac_today = tc / tcu if tcu > 0 else 0
+    cac_yesterday = yc / ycu if ycu > 0 else 0
+
+    # Calculate percentage changes
+    sales_change = ((ts - ys) / ys * 100) if ys > 0 else 0
+    cost_change = ((tc - yc) / yc * 100) if yc > 0 else 0
+
+    return MetricValues(profit_today, profit_yesterday, cac_today, cac_yesterday, sales_change, cost_change)
+
 def processing_node(state: State) -> State:
     """Calculate key business metrics from input data.
 
+    Deprecated as a graph node: the graphs run `fused_node` or
+    `metrics_node` instead.
+
     Args:
         state: The current state with validated input data.
 
     Returns:
         The state updated with calculated metrics.
     """
-    today = state["data"]["today"]
-    yesterday = state["data"]["yesterday"]
-    
-    # Calculate profits
-    profit_today = today["sales"] - today["costs"]
-    profit_yesterday = yesterday["sales"] - yesterday["costs"]
-    
-    # Calculate Customer Acquisition Cost (CAC)
-    cac_today = today["costs"] / today["customers"] if today["customers"] > 0 else 0
-    cac_yesterday = yesterday["costs"] / yesterday["customers"] if yesterday["customers"] > 0 else 0
-    
-    # Calculate percentage changes
-    sales_change = ((today["sales"] - yesterday["sales"]) / yesterday["sales"] * 100) if yesterday["sales"] > 0 else 0
-    cost_change = ((today["costs"] - yesterday["costs"]) / yesterday["costs"] * 100) if yesterday["costs"] > 0 else 0
-    
+    today, yesterday = _DAYS(state["data"])
+
+    profit_today, profit_yesterday, cac_today, cac_yesterday, sales_change, cost_change = _compute_metrics(*_FIELDS(today), *_FIELDS(yesterday))
+
     state["metrics"] = {
         "profit_today": profit_today,
         "profit_yesterday": profit_yesterday,
@@ -91,81 +209,252 @@ def processing_node(state: State) -> State:
     }
     return state
 
-def recommendation_node(state: State) -> State:
-    """Generate actionable recommendations based on calculated metrics.
+def _recommend(profit_today: float, cac_today: float, cac_yesterday: float, sales_change: float) -> Recommendations:
+    """Generate recommendations and alerts from the metrics that drive them.
 
     Args:
-        state: The current state with calculated metrics.
+        profit_today: Today's profit.
+        cac_today: Today's customer acquisition cost.
+        cac_yesterday: Yesterday's customer acquisition cost.
+        sales_change: Percentage change in sales since yesterday.
 
     Returns:
-        The state updated with recommendations and alerts.
+        The profit status, alerts and recommendations.
     """
-    metrics = state["metrics"]
-    profit_today = metrics["profit_today"]
-    cac_today = metrics["cac_today"]
-    cac_yesterday = metrics["cac_yesterday"]
-    sales_change = metrics["sales_change"]
-    
-    alerts = []
-    recommendations = []
-    
-    # Profit or loss status
+    # Profit or loss status. Each list is created with its first entry, if any,
+    # rather than appended to from empty.
     if profit_today >= 0:
-        profit_status = f"Profit: ${profit_today:.2f}"
+        profit_status = _fmt("profit", profit_today)
+        recommendations = []
     else:
-        profit_status = f"Loss: ${-profit_today:.2f}"
-        recommendations.append("Reduce costs to improve profitability")
+        profit_status = _fmt("loss", -profit_today)
+        recommendations = [_REC_REDUCE_COSTS]
     
     # Check for significant CAC increase
-    if cac_yesterday > 0:
-        cac_change = ((cac_today - cac_yesterday) / cac_yesterday) * 100
-        if cac_change > 20:
-            alerts.append(f"CAC increased by {cac_change:.2f}%, which is significant.")
-            recommendations.append("Review marketing campaigns for efficiency")
+    cac_change = ((cac_today - cac_yesterday) / cac_yesterday) * 100 if cac_yesterday > 0 else 0
+    if cac_change > 20:
+        alerts = [_fmt("cac_alert", cac_change)]
+        recommendations.append(_REC_REVIEW_MARKETING)
+    else:
+        alerts = []
     
     # Suggest budget increase if sales are growing
     if sales_change > 0:
-        recommendations.append(f"Consider increasing advertising budget due to {sales_change:.2f}% sales growth")
+        recommendations.append(_fmt("sales_rec", sales_change))
     
-    state["recommendations"] = {
+    return {
         "profit_status": profit_status,
         "alerts": alerts,
         "recommendations": recommendations
     }
+
+def recommendation_node(state: State) -> State:
+    """Generate actionable recommendations based on calculated metrics.
+
+    Deprecated as a graph node: the graphs run `fused_node` or
+    `metrics_node` instead.
+
+    Args:
+        state: The current state with calculated metrics.
+
+    Returns:
+        The state updated with recommendations and alerts.
+    """
+    metrics = state["metrics"]
+    state["recommendations"] = _recommend(
+        metrics["profit_today"], metrics["cac_today"], metrics["cac_yesterday"], metrics["sales_change"]
+    )
     return state
 
-def build_graph():
+def fused_node(state: State) -> dict[str, Any]:
+    """Validate input, calculate metrics and generate recommendations in one step.
+
+    Args:
+        state: The current state containing input data.
+
+    Returns:
+        An update containing only the calculated metrics and the
+        recommendations and alerts, so LangGraph writes just those channels.
+
+    Raises:
+        ValueError: If required data fields are missing.
+    """
+    today, yesterday = _DAYS(_validate_state(state))
+
+    metrics = _compute_metrics(*_FIELDS(today), *_FIELDS(yesterday))
+    profit_today, _, cac_today, cac_yesterday, sales_change, _ = metrics
+    return {
+        "metrics": metrics._asdict(),
+        "recommendations": _recommend(profit_today, cac_today, cac_yesterday, sales_change)
+    }
+
+def metrics_node(state: State) -> dict[str, Any]:
+    """Validate input and calculate metrics in one step, without recommendations.
+
+    Args:
+        state: The current state containing input data.
+
+    Returns:
+        An update containing only the calculated metrics.
+
+    Raises:
+        ValueError: If required data fields are missing.
+    """
+    today, yesterday = _DAYS(_validate_state(state))
+    return {"metrics": _compute_metrics(*_FIELDS(today), *_FIELDS(yesterday))._asdict()}
+
+def build_graph(mode: Mode = "full") -> "CompiledStateGraph[State, None, Any, Any]":
     """Build and compile the LangGraph structure.
 
+    Validation, metrics and recommendations run in a single fused node, which
+    avoids two extra supersteps of state bookkeeping per invocation. In
+    metrics mode the graph stops after the metrics are calculated.
+
+    Args:
+        mode: "full" for recommendations and alerts, "metrics" for the
+            calculated metrics only.
+
     Returns:
         The compiled LangGraph object.
+
+    Raises:
+        ValueError: If the mode is unknown.
     """
+    nodes = {"full": ("fused", fused_node), "metrics": ("metrics", metrics_node)}
+    if mode not in nodes:
+        raise ValueError(f"Unknown mode: {mode!r}")
+    name, node = nodes[mode]
+
     graph = StateGraph(State)
-    graph.add_node("input", input_node)
-    graph.add_node("processing", processing_node)
-    graph.add_node("recommendation", recommendation_node)
+    graph.add_node(name, node)
+    graph.add_edge(name, END)
     
-    graph.add_edge("input", "processing")
-    graph.add_edge("processing", "recommendation")
-    graph.add_edge("recommendation", END)
+    graph.set_entry_point(name)
     
-    graph.set_entry_point("input")
-    
-    return graph.compile()
+    # The agent is stateless and never pauses, so compile without a
+    # checkpointer or interrupts to keep per-step bookkeeping minimal.
+    return graph.compile(checkpointer=None, interrupt_before=[], interrupt_after=[], debug=False)
+
+# The graphs are static, so compile them once and reuse them for every invocation.
+graph = build_graph()
+metrics_graph = build_graph("metrics")
+
+# Full-mode results keyed by the six input fields, evicted in
+# least-recently-used order. Metrics-mode results echo the input value types
+# (int vs float), which equal keys cannot tell apart, so they are not cached.
+_CACHE_SIZE = 1024
+_cache: "OrderedDict[tuple[Any, ...], Recommendations]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _key(input_data: dict[str, Any]) -> Optional[tuple[Any, ...]]:
+    """Build a hashable cache key from the input data.
+
+    Args:
+        input_data: A dictionary containing business data for today and yesterday.
+
+    Returns:
+        A tuple of the input fields, or None if the input is malformed.
+    """
+    try:
+        today, yesterday = _DAYS(input_data)
+        key: tuple[Any, ...] = _FIELDS(today) + _FIELDS(yesterday)
+        hash(key)
+    except (KeyError, TypeError):
+        return None
+    return key
+
+def _copy(result: Recommendations) -> Recommendations:
+    """Copy a cached result so callers cannot mutate the cache."""
+    return {
+        "profit_status": result["profit_status"],
+        "alerts": list(result["alerts"]),
+        "recommendations": list(result["recommendations"])
+    }
 
-def run_agent(input_data: dict) -> dict:
+def run_agent_fast(
+    input_data: dict[str, Any], mode: Mode = "full", validated: bool = False
+) -> Union[Recommendations, Metrics]:
+    """Run the agent logic directly, without LangGraph orchestration.
+
+    This is a straight-line specialization of `fused_node` for the fixed input
+    schema: it reads the fields straight from the input and builds no
+    intermediate state or metrics dict, but produces the same result as
+    invoking the compiled graph.
+
+    Args:
+        input_data: A dictionary containing business data for today and yesterday.
+        mode: "full" for recommendations and alerts, "metrics" for the
+            calculated metrics only.
+        validated: Skip input validation, for trusted callers that have
+            already checked the input.
+
+    Returns:
+        A dictionary with recommendations and alerts, or with the metrics.
+
+    Raises:
+        ValueError: If required data fields are missing or the mode is unknown.
+    """
+    if mode not in ("full", "metrics"):
+        raise ValueError(f"Unknown mode: {mode!r}")
+    if not validated:
+        _validate(input_data)
+    today, yesterday = _DAYS(input_data)
+
+    metrics = _compute_metrics(*_FIELDS(today), *_FIELDS(yesterday))
+    if mode == "metrics":
+        return cast(Metrics, metrics._asdict())
+    profit_today, _, cac_today, cac_yesterday, sales_change, _ = metrics
+    return _recommend(profit_today, cac_today, cac_yesterday, sales_change)
+
+def run_agent(
+    input_data: dict[str, Any], use_graph: bool = False, mode: Mode = "full"
+) -> Union[Recommendations, Metrics]:
     """Run the agent with the provided input data.
 
+    Full-mode results of the direct path are memoized on the input values, so
+    repeated calls with the same data skip the computation entirely. Calls
+    with `use_graph=True` always invoke the graph.
+
     Args:
         input_data: A dictionary containing business data for today and yesterday.
+        use_graph: Invoke the compiled LangGraph instead of taking the
+            straight-line `run_agent_fast` path that bypasses LangGraph.
+        mode: "full" for recommendations and alerts, "metrics" to skip
+            generating recommendations and return the calculated metrics.
 
     Returns:
-        A dictionary with recommendations and alerts.
+        A dictionary with recommendations and alerts, or with the metrics.
+
+    Raises:
+        ValueError: If required data fields are missing or the mode is unknown.
     """
-    initial_state = {"data": input_data}
-    graph = build_graph()
-    final_state = graph.invoke(initial_state)
-    return final_state["recommendations"]
+    key = _key(input_data) if not use_graph and mode == "full" else None
+    if key is not None:
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+                return _copy(cached)
+
+    if not use_graph:
+        # Building the cache key already read every input field.
+        result = run_agent_fast(input_data, mode, validated=key is not None)
+    elif mode == "full":
+        final_state = graph.invoke({"data": input_data})
+        result = final_state["recommendations"]
+    elif mode == "metrics":
+        final_state = metrics_graph.invoke({"data": input_data})
+        result = final_state["metrics"]
+    else:
+        raise ValueError(f"Unknown mode: {mode!r}")
+
+    if key is not None:
+        with _cache_lock:
+            # Only full-mode results are given a key.
+            _cache[key] = _copy(cast(Recommendations, result))
+            if len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return result
 
 if __name__ == "__main__":
     sample_input = {
@@ -0,0 +1,132 @@
+"""Unit tests for the vectorized batch scoring."""
+
+import importlib.util
+import unittest
+
+from agent.graph import run_agent_fast
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+ROWS = [
+    [1000, 800, 50, 900, 750, 45],
+    [700, 800, 50, 900, 750, 45],
+    [1000, 800, 40, 900, 750, 50],
+    [500, 0, 0, 0, 0, 0],
+    [800, 800, 10, 900, 900, 0],
+    [100, 50, 5, -10, 20, -3],
+]
+
+
+def _as_input(row):
+    return {
+        "today": {"sales": row[0], "costs": row[1], "customers": row[2]},
+        "yesterday": {"sales": row[3], "costs": row[4], "customers": row[5]},
+    }
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestRunAgentBatch(unittest.TestCase):
+    def test_batch_matches_single_runs(self):
+        """Test that batch results match running the agent row by row."""
+        from agent.batch import run_agent_batch
+
+        results = run_agent_batch(ROWS)
+        self.assertEqual(results, [run_agent_fast(_as_input(row)) for row in ROWS])
+
+    def test_float32_batch_within_tolerance(self):
+        """Test that float32 results stay within the documented tolerance below $83,886."""
+        import numpy as np
+
+        from agent.batch import run_agent_batch
+
+        rng = np.random.default_rng(0)
+        rows = np.column_stack(
+            [
+                rng.integers(0, 8_000_000, size=(2000, 2)) / 100,
+                rng.integers(0, 500, size=2000),
+                rng.integers(1, 8_000_000, size=(2000, 2)) / 100,
+                rng.integers(0, 500, size=2000),
+            ]
+        )
+
+        approx = run_agent_batch(rows, dtype=np.float32)
+        exact = run_agent_batch(rows)
+        for a, e in zip(approx, exact):
+            a_profit = float(a["profit_status"].split("$")[1])
+            e_profit = float(e["profit_status"].split("$")[1])
+            self.assertLessEqual(abs(a_profit - e_profit), 0.02 + 1e-9)
+
+        approx_metrics = run_agent_batch(rows, dtype=np.float32, mode="metrics")
+        exact_metrics = run_agent_batch(rows, mode="metrics")
+        for name in ("sales_change", "cost_change", "cac_today", "cac_yesterday"):
+            np.testing.assert_allclose(
+                approx_metrics[name], exact_metrics[name], rtol=1e-5, atol=1e-4
+            )
+
+    def test_parallel_batch_matches_serial(self):
+        """Test that splitting rows across threads preserves metrics and order."""
+        import numpy as np
+
+        from agent.batch import run_agent_batch
+
+        rows = ROWS * 7
+        parallel = run_agent_batch(rows, workers=4, mode="metrics")
+        serial = run_agent_batch(rows, mode="metrics")
+        self.assertEqual(parallel.keys(), serial.keys())
+        for name in serial:
+            np.testing.assert_array_equal(parallel[name], serial[name])
+
+    def test_more_workers_than_rows(self):
+        """Test that asking for more workers than rows still scores every row."""
+        from agent.batch import run_agent_batch
+
+        rows = ROWS[:3]
+        metrics = run_agent_batch(rows, workers=8, mode="metrics")
+        self.assertEqual(len(metrics["profit_today"]), len(rows))
+        self.assertEqual(run_agent_batch(rows, workers=8), run_agent_batch(rows))
+
+    def test_metrics_mode(self):
+        """Test that metrics mode returns per-row metrics as arrays."""
+        from agent.batch import run_agent_batch
+
+        metrics = run_agent_batch(ROWS, workers=2, mode="metrics")
+        for i, row in enumerate(ROWS):
+            expected = run_agent_fast(_as_input(row), mode="metrics")
+            self.assertEqual(
+                {name: values[i] for name, values in metrics.items()}, expected
+            )
+
+    def test_large_customer_counts(self):
+        """Test that customer counts beyond the int32 range are scored exactly."""
+        from agent.batch import run_agent_batch
+
+        row = [1000, 800, 3_000_000_000, 900, 750, 45]
+        metrics = run_agent_batch([row], mode="metrics")
+        expected = run_agent_fast(_as_input(row), mode="metrics")
+        self.assertEqual(
+            {name: values[0] for name, values in metrics.items()}, expected
+        )
+
+    def test_invalid_customer_counts(self):
+        """Test handling of customer counts that would not survive the integer cast."""
+        import numpy as np
+
+        from agent.batch import run_agent_batch
+
+        with self.assertRaises(ValueError):
+            run_agent_batch([[1000, 800, 2.5, 900, 750, 45]])
+        with self.assertRaises(ValueError):
+            run_agent_batch(
+                [[1000, 800, 3_000_000_000, 900, 750, 45]], count_dtype=np.int32
+            )
+
+    def test_invalid_shape(self):
+        """Test handling of batch data with the wrong number of columns."""
+        from agent.batch import run_agent_batch
+
+        with self.assertRaises(ValueError):
+            run_agent_batch([[1000, 800, 50]])
+
+
+if __name__ == "__main__":
+    unittest.main()
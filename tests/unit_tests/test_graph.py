@@ -1,9 +1,25 @@
 """Unit tests for the LangGraph agent's graph functionality."""
 
 import unittest
-from agent.graph import run_agent
+from unittest import mock
+
+from agent.graph import (
+    _cache,
+    fused_node,
+    graph,
+    input_node,
+    metrics_graph,
+    processing_node,
+    recommendation_node,
+    run_agent,
+    run_agent_fast,
+)
+
 
 class TestBusinessAgent(unittest.TestCase):
+    def setUp(self):
+        _cache.clear()
+
     def test_profit_and_sales_growth(self):
         """Test profit calculation and sales growth recommendation."""
         input_data = {
@@ -44,5 +60,109 @@ class TestBusinessAgent(unittest.TestCase):
         with self.assertRaises(ValueError):
             run_agent(input_data)
 
+    def test_repeated_call_is_cached(self):
+        """Test that repeated calls return equal results unaffected by caller mutation."""
+        input_data = {
+            "today": {"sales": 1200, "costs": 900, "customers": 60},
+            "yesterday": {"sales": 1000, "costs": 850, "customers": 55}
+        }
+        first = run_agent(input_data)
+        first["recommendations"].append("mutated")
+        second = run_agent(input_data)
+        self.assertNotIn("mutated", second["recommendations"])
+        self.assertEqual(second["profit_status"], "Profit: $300.00")
+        self.assertIn("Consider increasing advertising budget due to 20.00% sales growth", second["recommendations"])
+
+    def test_fast_path_matches_graph(self):
+        """Test that the direct node path matches the compiled graph."""
+        for today, yesterday in [
+            ({"sales": 1000, "costs": 800, "customers": 40}, {"sales": 900, "costs": 750, "customers": 50}),
+            ({"sales": 700, "costs": 800, "customers": 50}, {"sales": 900, "costs": 750, "customers": 45}),
+            ({"sales": 500, "costs": 0, "customers": 0}, {"sales": 0, "costs": 0, "customers": 0}),
+        ]:
+            input_data = {"today": today, "yesterday": yesterday}
+            expected = graph.invoke({"data": input_data})["recommendations"]
+            self.assertEqual(run_agent_fast(input_data), expected)
+
+    def test_fused_node_matches_separate_nodes(self):
+        """Test that the fused node matches chaining the individual nodes."""
+        input_data = {
+            "today": {"sales": 1000, "costs": 800, "customers": 40},
+            "yesterday": {"sales": 900, "costs": 750, "customers": 50}
+        }
+        fused = fused_node({"data": input_data})
+        chained = recommendation_node(processing_node(input_node({"data": input_data})))
+        self.assertEqual(fused["metrics"], chained["metrics"])
+        self.assertEqual(fused["recommendations"], chained["recommendations"])
+        self.assertNotIn("data", fused)
+
+    def test_metrics_mode(self):
+        """Test that metrics mode returns the calculated metrics on both paths."""
+        input_data = {
+            "today": {"sales": 1000, "costs": 800, "customers": 40},
+            "yesterday": {"sales": 900, "costs": 750, "customers": 50}
+        }
+        result = run_agent(input_data, mode="metrics")
+        self.assertEqual(result["profit_today"], 200)
+        self.assertEqual(result["cac_today"], 20)
+        self.assertNotIn("recommendations", result)
+        self.assertEqual(run_agent_fast(input_data, mode="metrics"), metrics_graph.invoke({"data": input_data})["metrics"])
+        self.assertEqual(run_agent(input_data, use_graph=True, mode="metrics"), result)
+
+    def test_metrics_mode_keeps_value_types(self):
+        """Test that metrics for equal int and float inputs keep the input types."""
+        int_data = {
+            "today": {"sales": 1000, "costs": 800, "customers": 50},
+            "yesterday": {"sales": 900, "costs": 750, "customers": 45}
+        }
+        float_data = {
+            "today": {"sales": 1000.0, "costs": 800.0, "customers": 50},
+            "yesterday": {"sales": 900.0, "costs": 750.0, "customers": 45}
+        }
+        self.assertIsInstance(run_agent(int_data, mode="metrics")["profit_today"], int)
+        self.assertIsInstance(run_agent(float_data, mode="metrics")["profit_today"], float)
+
+    def test_unknown_mode(self):
+        """Test handling of an unknown mode."""
+        input_data = {
+            "today": {"sales": 1000, "costs": 800, "customers": 50},
+            "yesterday": {"sales": 900, "costs": 750, "customers": 45}
+        }
+        with self.assertRaises(ValueError):
+            run_agent(input_data, mode="summary")
+
+    def test_incomplete_input(self):
+        """Test handling of input with an empty or missing day, or of the wrong type."""
+        for input_data in [
+            {"today": {}, "yesterday": {"sales": 900, "costs": 750, "customers": 45}},
+            {"today": {"sales": 1000, "costs": 800, "customers": 50}},
+            [1000, 800, 50],
+            None,
+        ]:
+            with self.assertRaises(ValueError):
+                run_agent(input_data)
+
+    def test_graph_path_bypasses_cache(self):
+        """Test that use_graph invokes the graph even after a cached direct call."""
+        input_data = {
+            "today": {"sales": 1100, "costs": 800, "customers": 50},
+            "yesterday": {"sales": 900, "costs": 750, "customers": 45}
+        }
+        expected = run_agent(input_data)
+        with mock.patch.object(graph, "invoke", wraps=graph.invoke) as invoke:
+            self.assertEqual(run_agent(input_data, use_graph=True), expected)
+        invoke.assert_called_once()
+
+    def test_input_node_rejects_missing_data(self):
+        """Test that input_node raises ValueError for a missing or empty data channel."""
+        for state in [{}, {"data": None}, {"data": {}}]:
+            with self.assertRaises(ValueError):
+                input_node(state)
+
+    def test_invalid_input_graph_path(self):
+        """Test handling of invalid input data through the compiled graph."""
+        with self.assertRaises(ValueError):
+            run_agent({}, use_graph=True)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file